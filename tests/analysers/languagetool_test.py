@@ -1,7 +1,9 @@
+import asyncio
 import pytest
 
 from threading import Event
 from lsprotocol.types import (
+    Diagnostic,
     DidOpenTextDocumentParams,
     TextDocumentItem,
     DidChangeTextDocumentParams,
@@ -12,7 +14,8 @@ from lsprotocol.types import (
     DidSaveTextDocumentParams,
     TextDocumentIdentifier,
 )
-from textLSP.documents.document import BaseDocument
+from textLSP.types import Interval
+from textLSP.documents.document import BaseDocument, ChangeTracker
 from textLSP.analysers.languagetool import LanguageToolAnalyser
 
 from tests.lsp_test_client import session, utils
@@ -34,7 +37,63 @@ def test_analyse(analyser):
         config={},
         version=0
     )
-    analyser._analyse(doc.cleaned_source, doc)
+    asyncio.run(analyser._analyse(doc.cleaned_source, doc))
+
+
+class EditingTool():
+    """Extends the document while it is being checked."""
+
+    def __init__(self, doc, analyser):
+        self.doc = doc
+        self.analyser = analyser
+
+    def check(self, text):
+        change = TextDocumentContentChangeEvent_Type1(
+            range=Range(
+                start=Position(line=5, character=0),
+                end=Position(line=5, character=0),
+            ),
+            text='New one.\n',
+        )
+        self.doc.apply_change(change)
+        self.doc.version += 1
+        self.analyser.update_document(self.doc, change)
+        return []
+
+    def close(self):
+        pass
+
+
+def test_edit_during_check(analyser):
+    doc = BaseDocument(
+        'tmp.txt',
+        'This is a sentence.\n\nThis is another one.\n\nAnd a third one.\n',
+        config={},
+        version=0
+    )
+    diagnostic = Diagnostic(
+        range=Range(
+            start=Position(line=4, character=0),
+            end=Position(line=4, character=3),
+        ),
+        message='DUMMY',
+    )
+    analyser.init_document_items(doc)
+    analyser._diagnostics_dict[doc.uri].add(diagnostic.range.start, diagnostic)
+    analyser._content_change_dict[doc.uri] = ChangeTracker(doc, True)
+    analyser.tools['en-US'] = EditingTool(doc, analyser)
+
+    asyncio.run(analyser._did_change(doc, [Interval(0, 4), Interval(42, 3)]))
+
+    # only the unchecked changes are checked next time
+    tracker = analyser._content_change_dict[doc.uri]
+    assert not tracker.full_document_change
+    assert tracker.get_changes() == [
+        Interval(0, 4),
+        Interval(42, 3),
+        Interval(60, 9),
+    ]
+    assert list(analyser.get_diagnostics(doc)) == [diagnostic]
 
 
 def test_bug1(json_converter, langtool_ls_onsave):
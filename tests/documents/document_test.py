@@ -4,6 +4,7 @@ from lsprotocol.types import (
     Position,
     Range,
     TextDocumentContentChangeEvent_Type1,
+    TextDocumentContentChangeEvent_Type2,
 )
 
 from textLSP.types import Interval
@@ -527,7 +528,7 @@ def test_updates(content, edits, exp):
 
     for edit in edits:
         doc.apply_change(edit)
-        tracker.update_document(edit, doc)
+        tracker.update_document(edit)
 
     assert tracker.get_changes() == exp
 
@@ -553,3 +554,121 @@ def test_document_language(content, lang, exp):
     doc = BaseDocument("DUMMY_URL", content, config=config)
 
     assert doc.language == exp
+
+
+def test_offsets_after_change():
+    doc = BaseDocument('DUMMY_URL', 'This is\na document.\n')
+    assert doc.position_at_offset(10) == Position(line=1, character=2)
+    assert doc.offset_at_position(Position(line=1, character=2)) == 10
+
+    doc.apply_change(
+        TextDocumentContentChangeEvent_Type1(
+            range=Range(
+                start=Position(line=0, character=0),
+                end=Position(line=0, character=0),
+            ),
+            text='Hi!\n',
+        )
+    )
+    assert doc.lines == ['Hi!\n', 'This is\n', 'a document.\n']
+    assert doc.position_at_offset(10) == Position(line=1, character=6)
+    assert doc.offset_at_position(Position(line=2, character=2)) == 14
+    assert doc.range_at_offset(10, 6) == Range(
+        start=Position(line=1, character=6),
+        end=Position(line=2, character=3),
+    )
+    assert doc.last_position() == Position(line=2, character=11)
+
+
+def test_empty_document():
+    doc = BaseDocument('DUMMY_URL', '')
+
+    assert doc.paragraph_at_offset(0) == Interval(0, 0)
+    assert doc.paragraph_at_offset(0, min_length=10, min_offset=5) == Interval(0, 0)
+    assert doc.sentence_at_offset(0) == Interval(0, 0)
+    assert doc.paragraphs_at_offset(0) == []
+    assert doc.position_at_offset(0) == Position(line=0, character=0)
+
+
+def test_updates_full_change():
+    doc = BaseDocument('DUMMY_URL', 'This is a sentence.')
+    tracker = ChangeTracker(doc, True)
+
+    edits = [
+        TextDocumentContentChangeEvent_Type1(
+            range=Range(
+                start=Position(line=0, character=8),
+                end=Position(line=0, character=9),
+            ),
+            text='the',
+        ),
+        TextDocumentContentChangeEvent_Type2(text='A new sentence.'),
+        TextDocumentContentChangeEvent_Type1(
+            range=Range(
+                start=Position(line=0, character=0),
+                end=Position(line=0, character=1),
+            ),
+            text='The',
+        ),
+    ]
+    for edit in edits:
+        doc.apply_change(edit)
+        tracker.update_document(edit)
+
+    assert tracker.full_document_change
+    assert tracker.get_changes() == [Interval(0, 17)]
+    assert tracker.document.source == 'The new sentence.'
+
+
+def test_updates_pending_changes():
+    doc = BaseDocument('DUMMY_URL', 'This is a sentence.')
+    tracker = ChangeTracker(doc, True)
+
+    for idx in range(16):
+        edit = TextDocumentContentChangeEvent_Type1(
+            range=Range(
+                start=Position(line=0, character=10+idx),
+                end=Position(line=0, character=10+idx),
+            ),
+            text='a',
+        )
+        doc.apply_change(edit)
+        tracker.update_document(edit)
+
+    # not applied before the changes are queried
+    assert len(tracker._pending_changes) == 16
+    assert tracker.document.source == 'This is a sentence.'
+
+    assert tracker.get_changes() == [
+        Interval(10+idx, 1)
+        for idx in range(16)
+    ]
+    assert len(tracker._pending_changes) == 0
+    assert tracker.document.source == doc.source
+
+
+def test_restore_changes():
+    doc = BaseDocument('DUMMY_URL', 'This is a sentence.', version=0)
+    tracker = ChangeTracker(doc, True)
+
+    edit = TextDocumentContentChangeEvent_Type1(
+        range=Range(
+            start=Position(line=0, character=0),
+            end=Position(line=0, character=0),
+        ),
+        text='A ',
+    )
+    doc.apply_change(edit)
+    tracker.update_document(edit)
+    tracker.restore_changes([Interval(5, 2), Interval(10, 1)], 0)
+
+    assert not tracker.full_document_change
+    assert tracker.get_changes() == [
+        Interval(0, 2),
+        Interval(7, 2),
+        Interval(12, 1),
+    ]
+
+    # offsets of an unknown text
+    tracker.restore_changes([Interval(5, 2)], 1)
+    assert tracker.full_document_change
@@ -112,6 +112,53 @@ def test_latex_clean(src, clean):
     assert doc.cleaned_source == clean
 
 
+def test_latex_parse_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(LatexDocument, 'PARSE_CACHE_PATH', str(tmp_path))
+    src = (
+        '\\section{Introduction}\n'
+        '\n'
+        'This is a \\textbf{sentence}.'
+    )
+    config = {LatexDocument.CONFIGURATION_PARSE_CACHE: True}
+
+    doc = LatexDocument('tmp.tex', src, config=config)
+    assert doc.cleaned_source == 'Introduction\n\nThis is a sentence.\n'
+    assert len(list(tmp_path.glob('*.pickle'))) == 1
+
+    doc = LatexDocument('tmp.tex', src, config=config)
+    assert doc.cleaned_source == 'Introduction\n\nThis is a sentence.\n'
+    assert doc._tree is None
+    assert doc.range_at_offset(14, 4, True) == Range(
+        start=Position(line=2, character=0),
+        end=Position(line=2, character=3),
+    )
+
+
+def test_non_ascii_positions():
+    doc = LatexDocument(
+        'tmp.tex',
+        '\\section{Café}\n'
+        '\n'
+        'À très \\textbf{bien} fait.'
+    )
+    assert doc.cleaned_source == 'Café\n\nÀ très bien fait.\n'
+
+    assert doc.position_at_offset(3, True) == Position(line=0, character=12)
+    assert doc.position_at_offset(13, True) == Position(line=2, character=15)
+    assert doc.position_at_offset(18, True) == Position(line=2, character=21)
+    assert doc.range_at_offset(0, 4, True) == Range(
+        start=Position(line=0, character=9),
+        end=Position(line=0, character=12),
+    )
+    assert doc.range_at_offset(8, 4, True) == Range(
+        start=Position(line=2, character=2),
+        end=Position(line=2, character=5),
+    )
+    assert doc.offset_at_position(Position(line=2, character=4), True) == 10
+    assert doc.offset_at_position(Position(line=2, character=21), True) == 18
+    assert doc.last_position(True) == Position(line=2, character=26)
+
+
 @pytest.mark.parametrize('src,offset,exp', [
     (
         '\\section{Introduction}\n'
@@ -606,7 +653,7 @@ def test_change_tracker(content, edits, exp):
 
     for edit in edits:
         doc.apply_change(edit)
-        tracker.update_document(edit, doc)
+        tracker.update_document(edit)
 
     assert tracker.get_changes() == exp
 
@@ -1052,6 +1099,94 @@ def test_change_tracker(content, edits, exp):
         None,
         None,
     ),
+    (
+        '\\documentclass[11pt]{article}\n'
+        '\\begin{document}\n'
+        '\n'
+        '\\section{Introduction}\n'
+        '\n'
+        'Thé café is open.\n'
+        '\n'
+        '\\end{document}',
+        [
+            TextDocumentContentChangeEvent_Type1(
+                # delete 'é' from Thé
+                range=Range(
+                    start=Position(
+                        line=5,
+                        character=2,
+                    ),
+                    end=Position(
+                        line=5,
+                        character=3,
+                    ),
+                ),
+                text='',
+            ),
+        ],
+        'Introduction\n'
+        '\n'
+        'Th café is open.\n',
+        (
+            -6,
+            'open.',
+            Range(
+                start=Position(5, 11),
+                end=Position(5, 15),
+            ),
+        ),
+        (
+            Position(
+                line=5,
+                character=11,
+            ),
+            'open.',
+        ),
+    ),
+    (
+        '\\documentclass[11pt]{article}\n'
+        '\\begin{document}\n'
+        '\n'
+        '\\section{Introduction}\n'
+        '\n'
+        'Thé café is open.\n'
+        '\n'
+        '\\end{document}',
+        [
+            TextDocumentContentChangeEvent_Type1(
+                # insert 'très ' before café
+                range=Range(
+                    start=Position(
+                        line=5,
+                        character=4,
+                    ),
+                    end=Position(
+                        line=5,
+                        character=4,
+                    ),
+                ),
+                text='très ',
+            ),
+        ],
+        'Introduction\n'
+        '\n'
+        'Thé très café is open.\n',
+        (
+            -6,
+            'open.',
+            Range(
+                start=Position(5, 17),
+                end=Position(5, 21),
+            ),
+        ),
+        (
+            Position(
+                line=5,
+                character=17,
+            ),
+            'open.',
+        ),
+    ),
 ])
 def test_edits(content, changes, exp, offset_test, position_test):
     doc = LatexDocument('DUMMY_URL', content)
@@ -110,6 +110,30 @@ def test_highlight(src, offset, exp):
     assert res == exp
 
 
+def test_non_ascii_positions():
+    doc = MarkDownDocument(
+        'tmp.md',
+        '# Café\n'
+        'À très bien fait.'
+    )
+    assert doc.cleaned_source == 'Café\n\nÀ très bien fait.\n'
+
+    assert doc.position_at_offset(3, True) == Position(line=0, character=5)
+    assert doc.position_at_offset(13, True) == Position(line=1, character=7)
+    assert doc.position_at_offset(18, True) == Position(line=1, character=12)
+    assert doc.range_at_offset(0, 4, True) == Range(
+        start=Position(line=0, character=2),
+        end=Position(line=0, character=5),
+    )
+    assert doc.range_at_offset(8, 4, True) == Range(
+        start=Position(line=1, character=2),
+        end=Position(line=1, character=5),
+    )
+    assert doc.offset_at_position(Position(line=1, character=4), True) == 10
+    assert doc.offset_at_position(Position(line=1, character=12), True) == 18
+    assert doc.last_position(True) == Position(line=1, character=17)
+
+
 @pytest.mark.parametrize('content,changes,exp,offset_test,position_test', [
     (
         'This is a sentence.',
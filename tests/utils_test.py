@@ -206,3 +206,18 @@ def test_token_diff(s1, s2, exp):
     res = types.TokenDiff.token_level_diff(s1, s2)
 
     assert res == exp
+
+
+@pytest.mark.parametrize('old,new,exp', [
+    ('This is a sentence.', 'This is a sentence.', (19, 19, 19)),
+    ('This is a sentence.', 'This is the sentence.', (8, 9, 11)),
+    ('This is a sentence.', 'This is a sentence. And more.', (19, 19, 29)),
+    ('This is a sentence.', 'sentence.', (0, 10, 0)),
+    ('aaa', 'aa', (2, 3, 2)),
+    ('', 'New text.', (0, 0, 9)),
+])
+def test_get_changed_span(old, new, exp):
+    res = utils.get_changed_span(old, new)
+
+    assert res == exp
+    assert old[:res[0]] + new[res[0]:res[2]] + old[res[1]:] == new
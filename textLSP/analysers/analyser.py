@@ -44,12 +44,14 @@ class Analyser():
     CONFIGURATION_CHECK_ON_OPEN = 'on_open'
     CONFIGURATION_CHECK_ON_CHANGE = 'on_change'
     CONFIGURATION_CHECK_ON_SAVE = 'on_save'
+    CONFIGURATION_CHECK_DEBOUNCE = 'debounce_ms'
 
     SETTINGS_DEFAULT_CHECK_ON = {
         CONFIGURATION_CHECK_ON_OPEN: True,
         CONFIGURATION_CHECK_ON_CHANGE: False,
         CONFIGURATION_CHECK_ON_SAVE: True,
     }
+    SETTINGS_DEFAULT_CHECK_DEBOUNCE = 300
 
     def __init__(self, language_server: LanguageServer, config: dict, name: str):
         self.name = name
@@ -63,10 +65,10 @@ class Analyser():
         self._checked_documents = set()
         self._progressbar_token = ProgressBar.create_token()
 
-    def _did_open(self, doc: Document):
+    async def _did_open(self, doc: Document):
         raise NotImplementedError()
 
-    def did_open(self, params: DidOpenTextDocumentParams):
+    async def did_open(self, params: DidOpenTextDocumentParams):
         doc = self.get_document(params)
         self.init_document_items(doc)
         self._content_change_dict[doc.uri] = ChangeTracker(doc, True)
@@ -76,10 +78,10 @@ class Analyser():
                     f'{self.name} checking',
                     token=self._progressbar_token
             ):
-                self._did_open(doc)
+                await self._did_open(doc)
                 self._checked_documents.add(doc.uri)
 
-    def _did_change(self, doc: Document, changes: List[Interval]):
+    async def _did_change(self, doc: Document, changes: List[Interval]):
         raise NotImplementedError()
 
     def _handle_line_shifts(self, params: DidChangeTextDocumentParams):
@@ -293,37 +295,60 @@ class Analyser():
             )
 
     def did_change(self, params: DidChangeTextDocumentParams):
+        """
+        Updates the stored code items according to the changes. Checking the
+        changed content is done separately in `check_changes()`.
+        """
         doc = self.get_document(params)
         should_update_diagnostics = self._handle_shifts(params)
         self._update_code_actions(doc)
 
-        if self.should_run_on(Analyser.CONFIGURATION_CHECK_ON_CHANGE):
-            if self._content_change_dict[doc.uri].full_document_change:
-                self.did_open(
-                    DidOpenTextDocumentParams(params.text_document)
-                )
-            else:
-                changes = self._content_change_dict[doc.uri].get_changes()
-                self._content_change_dict[doc.uri] = ChangeTracker(doc, True)
-                with ProgressBar(
-                        self.language_server,
-                        f'{self.name} checking',
-                        token=self._progressbar_token
-                ):
-                    self._did_change(doc, changes)
-        elif should_update_diagnostics:
+        if should_update_diagnostics:
+            # don't wait for the debounced check to show the shifted items
             self.language_server.publish_stored_diagnostics(doc)
 
+    async def check_changes(self, params: DidChangeTextDocumentParams):
+        if not self.should_run_on(Analyser.CONFIGURATION_CHECK_ON_CHANGE):
+            return
+
+        doc = self.get_document(params)
+        if self._content_change_dict[doc.uri].full_document_change:
+            await self.did_open(
+                DidOpenTextDocumentParams(params.text_document)
+            )
+        else:
+            changes = self._content_change_dict[doc.uri].get_changes()
+            self._content_change_dict[doc.uri] = ChangeTracker(doc, True)
+            with ProgressBar(
+                    self.language_server,
+                    f'{self.name} checking',
+                    token=self._progressbar_token
+            ):
+                await self._did_change(doc, changes)
+
+    def get_check_debounce(self) -> float:
+        """
+        Returns the time in seconds to wait for further changes before checking
+        them.
+        """
+        return self.config.setdefault(
+                Analyser.CONFIGURATION_CHECK,
+                dict()
+        ).setdefault(
+            Analyser.CONFIGURATION_CHECK_DEBOUNCE,
+            Analyser.SETTINGS_DEFAULT_CHECK_DEBOUNCE,
+        ) / 1000
+
     def update_document(self, doc: Document, change: TextDocumentContentChangeEvent):
-        self._content_change_dict[doc.uri].update_document(change, doc)
+        self._content_change_dict[doc.uri].update_document(change)
 
-    def did_save(self, params: DidSaveTextDocumentParams):
+    async def did_save(self, params: DidSaveTextDocumentParams):
         if self.should_run_on(Analyser.CONFIGURATION_CHECK_ON_SAVE):
             doc = self.get_document(params)
 
             if len(self._content_change_dict[doc.uri]) > 0:
                 if self._content_change_dict[doc.uri].full_document_change:
-                    self.did_open(
+                    await self.did_open(
                         DidOpenTextDocumentParams(params.text_document)
                     )
                 else:
@@ -334,7 +359,7 @@ class Analyser():
                             f'{self.name} checking',
                             token=self._progressbar_token
                     ):
-                        self._did_change(doc, changes)
+                        await self._did_change(doc, changes)
 
     def _did_close(self, doc: Document):
         pass
@@ -524,13 +549,13 @@ class Analyser():
         self.init_diagnostics(doc)
         self.init_code_actions(doc)
 
-    def _command_analyse(self, doc: BaseDocument, interval: Interval = None):
+    async def _command_analyse(self, doc: BaseDocument, interval: Interval = None):
         if interval is not None:
-            self._did_change(doc, [interval])
+            await self._did_change(doc, [interval])
         else:
-            self._did_open(doc)
+            await self._did_open(doc)
 
-    def command_analyse(self, *args):
+    async def command_analyse(self, *args):
         args = args[0]
         doc = self.get_document(args['uri'])
         if 'interval' in args:
@@ -541,14 +566,14 @@ class Analyser():
                     f'{self.name} checking',
                     token=self._progressbar_token
             ):
-                self._command_analyse(doc, interval)
+                await self._command_analyse(doc, interval)
         else:
             with ProgressBar(
                     self.language_server,
                     f'{self.name} checking',
                     token=self._progressbar_token
             ):
-                self._command_analyse(doc)
+                await self._command_analyse(doc)
             self._checked_documents.add(args['uri'])
 
     def get_completions(self, params: Optional[CompletionParams] = None) -> Optional[CompletionList]:
@@ -126,12 +126,12 @@ class GramformerAnalyser(Analyser):
 
         return diagnostics, code_actions
 
-    def _did_open(self, doc: BaseDocument):
+    async def _did_open(self, doc: BaseDocument):
         diagnostics, actions = self._analyse_sentences(doc.cleaned_source, doc)
         self.add_diagnostics(doc, diagnostics)
         self.add_code_actions(doc, actions)
 
-    def _did_change(self, doc: BaseDocument, changes: List[Interval]):
+    async def _did_change(self, doc: BaseDocument, changes: List[Interval]):
         diagnostics = list()
         code_actions = list()
         checked = set()
@@ -90,7 +90,7 @@ class GrammarBotAnalyser(Analyser):
 
         return diagnostics, code_actions
 
-    def _did_open(self, doc: BaseDocument):
+    async def _did_open(self, doc: BaseDocument):
         diagnostics, code_actions = self._handle_analyses(
             doc,
             self._analyse_text(doc.cleaned_source)
@@ -98,7 +98,7 @@ class GrammarBotAnalyser(Analyser):
         self.add_diagnostics(doc, diagnostics)
         self.add_code_actions(doc, code_actions)
 
-    def _did_change(self, doc: BaseDocument, changes: List[Interval]):
+    async def _did_change(self, doc: BaseDocument, changes: List[Interval]):
         text = ''
         # (in_text_start_offset, in_analysis_text_end_offset_inclusive)
         text_sections = list()
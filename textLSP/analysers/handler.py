@@ -30,6 +30,11 @@ class AnalyserHandler():
     def __init__(self, language_server, settings=None):
         self.language_server = language_server
         self.analysers = dict()
+        # (document uri, analyser name) -> asyncio.TimerHandle
+        self._pending_checks = dict()
+        # asyncio.Task -> (document uri, analyser name), the event loop only
+        # keeps weak references to tasks
+        self._running_checks = dict()
         self.update_settings(settings)
 
     def update_settings(self, settings):
@@ -73,6 +78,11 @@ class AnalyserHandler():
                 analyser.close()
 
     def shutdown(self):
+        for handle in self._pending_checks.values():
+            handle.cancel()
+        self._pending_checks = dict()
+        for task in list(self._running_checks):
+            task.cancel()
         for analyser in self.analysers.values():
             analyser.close()
 
@@ -106,28 +116,24 @@ class AnalyserHandler():
 
         return res if len(res) > 0 else None
 
-    async def _submit_task(self, function, *args, **kwargs):
-        functions = list()
-        for name, analyser in self.analysers.items():
-            functions.append(
-                self.language_server.loop.create_task(
-                    function(name, analyser, *args, **kwargs)
-                )
+    async def _run_task(self, function, analyser_name: str, analyser: Analyser, *args, **kwargs):
+        # errors are handled per analyser so that a failing one does not
+        # cancel the others in the task group
+        try:
+            await function(analyser_name, analyser, *args, **kwargs)
+        except Exception as e:
+            self.language_server.show_message(
+                str('Server error. See log for details.'),
+                MessageType.Error,
             )
+            logger.exception(str(e))
 
-        if len(functions) == 0:
-            return
-
-        done, pending = await asyncio.wait(functions)
-        for task in done:
-            try:
-                task.result()
-            except Exception as e:
-                self.language_server.show_message(
-                    str('Server error. See log for details.'),
-                    MessageType.Error,
+    async def _submit_task(self, function, *args, **kwargs):
+        async with asyncio.TaskGroup() as task_group:
+            for name, analyser in self.analysers.items():
+                task_group.create_task(
+                    self._run_task(function, name, analyser, *args, **kwargs)
                 )
-                logger.exception(str(e))
 
     async def _did_open(
         self,
@@ -136,7 +142,7 @@ class AnalyserHandler():
         params: DidOpenTextDocumentParams,
     ):
         try:
-            analyser.did_open(
+            await analyser.did_open(
                 params,
             )
         except AnalysisError as e:
@@ -173,6 +179,95 @@ class AnalyserHandler():
             params=params
         )
 
+        # bursts of changes are checked only once after the last one
+        for name, analyser in self.analysers.items():
+            if analyser.should_run_on(Analyser.CONFIGURATION_CHECK_ON_CHANGE):
+                self._schedule_check_changes(name, analyser, params)
+
+    def _schedule_check_changes(
+        self,
+        analyser_name: str,
+        analyser: Analyser,
+        params: DidChangeTextDocumentParams,
+    ):
+        key = (params.text_document.uri, analyser_name)
+        handle = self._pending_checks.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+        self._pending_checks[key] = self.language_server.loop.call_later(
+            analyser.get_check_debounce(),
+            self._run_pending_check,
+            key,
+            analyser_name,
+            analyser,
+            params,
+        )
+
+    def _run_pending_check(
+        self,
+        key,
+        analyser_name: str,
+        analyser: Analyser,
+        params: DidChangeTextDocumentParams,
+    ):
+        self._pending_checks.pop(key, None)
+        if self.analysers.get(analyser_name) is not analyser:
+            # analyser was disabled or reinitialized in the meantime
+            return
+
+        # the older check of the same document is outdated, it gives back
+        # its unchecked changes to the analyser when cancelled
+        previous = [
+            task
+            for task, running_key in self._running_checks.items()
+            if running_key == key
+        ]
+        for task in previous:
+            task.cancel()
+
+        task = self.language_server.loop.create_task(
+            self._check_changes(analyser_name, analyser, params, previous)
+        )
+        self._running_checks[task] = key
+        task.add_done_callback(self._check_done)
+
+    def _check_done(self, task: asyncio.Task):
+        self._running_checks.pop(task, None)
+
+    def _cancel_pending_checks(self, uri: str):
+        for key in [key for key in self._pending_checks if key[0] == uri]:
+            self._pending_checks.pop(key).cancel()
+        for task, key in list(self._running_checks.items()):
+            if key[0] == uri:
+                task.cancel()
+
+    async def _check_changes(
+        self,
+        analyser_name: str,
+        analyser: Analyser,
+        params: DidChangeTextDocumentParams,
+        previous: List[asyncio.Task] = None,
+    ):
+        if previous:
+            await asyncio.wait(previous)
+
+        try:
+            await analyser.check_changes(
+                params,
+            )
+        except AnalysisError as e:
+            self.language_server.show_message(
+                str(f'{analyser_name}: {e}'),
+                MessageType.Error,
+            )
+        except Exception as e:
+            self.language_server.show_message(
+                str('Server error. See log for details.'),
+                MessageType.Error,
+            )
+            logger.exception(str(e))
+
     async def _did_save(
         self,
         analyser_name: str,
@@ -180,7 +275,7 @@ class AnalyserHandler():
         params: DidSaveTextDocumentParams,
     ):
         try:
-            analyser.did_save(
+            await analyser.did_save(
                 params,
             )
         except AnalysisError as e:
@@ -206,6 +301,7 @@ class AnalyserHandler():
         )
 
     async def did_close(self, params: DidCloseTextDocumentParams):
+        self._cancel_pending_checks(params.text_document.uri)
         await self._submit_task(
             self._did_close,
             params=params
@@ -218,7 +314,7 @@ class AnalyserHandler():
         args,
     ):
         try:
-            analyser.command_analyse(*args)
+            await analyser.command_analyse(*args)
         except AnalysisError as e:
             self.language_server.show_message(
                 str(f'{analyser_name}: {e}'),
@@ -231,7 +327,7 @@ class AnalyserHandler():
             analyser_name = args[0].pop('analyser')
             analyser = self.analysers[analyser_name]
             try:
-                analyser.command_analyse(*args)
+                await analyser.command_analyse(*args)
             except AnalysisError as e:
                 self.language_server.show_message(
                     str(f'{analyser_name}: {e}'),
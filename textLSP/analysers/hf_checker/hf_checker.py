@@ -152,12 +152,12 @@ class HFCheckerAnalyser(Analyser):
 
         return diagnostics, code_actions
 
-    def _did_open(self, doc: BaseDocument):
+    async def _did_open(self, doc: BaseDocument):
         diagnostics, actions = self._analyse_lines(doc.cleaned_source, doc)
         self.add_diagnostics(doc, diagnostics)
         self.add_code_actions(doc, actions)
 
-    def _did_change(self, doc: BaseDocument, changes: List[Interval]):
+    async def _did_change(self, doc: BaseDocument, changes: List[Interval]):
         diagnostics = list()
         code_actions = list()
         checked = set()
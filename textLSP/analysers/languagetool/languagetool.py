@@ -1,6 +1,7 @@
+import asyncio
 import logging
 
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 from language_tool_python import LanguageTool
 from lsprotocol.types import (
         Diagnostic,
@@ -20,8 +21,9 @@ from ...documents.document import BaseDocument
 logger = logging.getLogger(__name__)
 
 
-LANGUAGE_MAP = dict()
-LANGUAGE_MAP['en'] = 'en-US'
+LANGUAGE_MAP = {
+    'en': 'en-US',
+}
 
 DEFAULT_LANGUAGE = 'en'
 
@@ -31,11 +33,36 @@ class LanguageToolAnalyser(Analyser):
         super().__init__(language_server, config, name)
         self.tools = dict()
         self._tool_backoff = dict()
+        # uri -> {future: tool} of the checks running in the executor
+        self._running_checks = dict()
 
-    def _analyse(self, text, doc, offset=0) -> Tuple[List[Diagnostic], List[CodeAction]]:
+    async def _analyse(self, text, doc, offset=0) -> Optional[Tuple[List[Diagnostic], List[CodeAction]]]:
+        """
+        :return: None if the document was edited or closed during the check
+        """
         diagnostics = list()
         code_actions = list()
-        matches = self._get_tool_for_language(doc.language).check(text)
+        tool = self._get_tool_for_language(doc.language)
+        version = doc.version
+        # checking is a blocking request to the LanguageTool server so keep the
+        # event loop free in the meantime
+        future = asyncio.get_running_loop().run_in_executor(
+            None,
+            tool.check,
+            text,
+        )
+        checks = self._running_checks.setdefault(doc.uri, dict())
+        checks[future] = tool
+        future.add_done_callback(
+            lambda _: self._check_done(doc.uri, future)
+        )
+        # the tool can't be closed while it is checking, so let the future
+        # run to the end even if the analysis is cancelled
+        matches = await asyncio.shield(future)
+
+        if doc.version != version or not self._is_open(doc):
+            # the offsets are not valid anymore
+            return None
 
         for match in matches:
             token = text[match.offset:match.offset+match.errorLength]
@@ -71,14 +98,70 @@ class LanguageToolAnalyser(Analyser):
 
         return diagnostics, code_actions
 
-    def _did_open(self, doc: BaseDocument):
-        diagnostics, actions = self._analyse(doc.cleaned_source, doc)
+    def _check_done(self, uri, future):
+        checks = self._running_checks.get(uri, dict())
+        checks.pop(future, None)
+        if len(checks) == 0:
+            self._running_checks.pop(uri, None)
+
+    def _is_open(self, doc: BaseDocument) -> bool:
+        if self.language_server is None:
+            return True
+        return doc.uri in self.language_server.workspace.documents
+
+    async def _did_open(self, doc: BaseDocument):
+        try:
+            res = await self._analyse(doc.cleaned_source, doc)
+        except asyncio.CancelledError:
+            if doc.uri in self._content_change_dict:
+                self._content_change_dict[doc.uri].set_full_document_change()
+            raise
+
+        if res is None:
+            if self._is_open(doc):
+                # let's check the whole document next time
+                self._content_change_dict[doc.uri].set_full_document_change()
+            return
+
+        diagnostics, actions = res
         self.add_diagnostics(doc, diagnostics)
         self.add_code_actions(doc, actions)
 
-    def _did_change(self, doc: BaseDocument, changes: List[Interval]):
+    async def _did_change(self, doc: BaseDocument, changes: List[Interval]):
+        version = doc.version
+        try:
+            res = await self._check_changes(doc, changes)
+        except asyncio.CancelledError:
+            self._restore_changes(doc, changes, version)
+            raise
+
+        if res is None:
+            if self._is_open(doc):
+                self._restore_changes(doc, changes, version)
+            return
+
+        diagnostics, code_actions, pos_ranges = res
+        for pos_range in pos_ranges:
+            self.remove_code_items_at_range(doc, pos_range)
+        self.add_diagnostics(doc, diagnostics)
+        self.add_code_actions(doc, code_actions)
+
+    def _restore_changes(self, doc: BaseDocument, changes: List[Interval], version: int):
+        # the changes were not checked, mark them to be checked next time
+        if doc.uri in self._content_change_dict:
+            self._content_change_dict[doc.uri].restore_changes(changes, version)
+
+    async def _check_changes(
+        self,
+        doc: BaseDocument,
+        changes: List[Interval],
+    ) -> Optional[Tuple[List[Diagnostic], List[CodeAction], List[Range]]]:
+        """
+        :return: None if the document was edited or closed during the check
+        """
         diagnostics = list()
         code_actions = list()
+        pos_ranges = list()
         checked = set()
         doc_length = len(doc.cleaned_source)
         for change in changes:
@@ -129,9 +212,8 @@ class LanguageToolAnalyser(Analyser):
                 end_sent.start-paragraph.start-1 + end_sent.length,
                 True
             )
-            self.remove_code_items_at_range(doc, pos_range)
 
-            diags, actions = self._analyse(
+            res = await self._analyse(
                 doc.text_at_offset(
                     start_sent.start,
                     end_sent.start-start_sent.start-1 + end_sent.length,
@@ -140,6 +222,10 @@ class LanguageToolAnalyser(Analyser):
                 doc,
                 start_sent.start,
             )
+            if res is None:
+                return None
+            diags, actions = res
+            pos_ranges.append(pos_range)
 
             diagnostics.extend([
                 diag
@@ -153,8 +239,8 @@ class LanguageToolAnalyser(Analyser):
             ])
 
             checked.add(paragraph)
-        self.add_diagnostics(doc, diagnostics)
-        self.add_code_actions(doc, code_actions)
+
+        return diagnostics, code_actions, pos_ranges
 
     def _did_close(self, doc: BaseDocument):
         workspace = self.language_server.workspace
@@ -177,13 +263,29 @@ class LanguageToolAnalyser(Analyser):
 
 
             if lang in self.tools:
-                self.tools[lang].close()
-                del self.tools[lang]
+                self._close_tool(self.tools.pop(lang))
+
+    def _close_tool(self, tool):
+        running = [
+            future
+            for checks in self._running_checks.values()
+            for future, check_tool in checks.items()
+            if check_tool is tool
+        ]
+        if len(running) == 0:
+            tool.close()
+            return
+
+        # close the tool once its last check has finished
+        asyncio.gather(
+            *running,
+            return_exceptions=True,
+        ).add_done_callback(lambda _: tool.close())
 
     def close(self):
         for lang, tool in self.tools.items():
-            tool.close()
-        self.tool = dict()
+            self._close_tool(tool)
+        self.tools = dict()
 
     def __del__(self):
         self.close()
@@ -175,7 +175,7 @@ class OpenAIAnalyser(Analyser):
 
         return diagnostics, code_actions
 
-    def _did_open(self, doc: BaseDocument):
+    async def _did_open(self, doc: BaseDocument):
         diagnostics = list()
         code_actions = list()
         checked = set()
@@ -188,7 +188,7 @@ class OpenAIAnalyser(Analyser):
         self.add_diagnostics(doc, diagnostics)
         self.add_code_actions(doc, code_actions)
 
-    def _did_change(self, doc: BaseDocument, changes: List[Interval]):
+    async def _did_change(self, doc: BaseDocument, changes: List[Interval]):
         diagnostics = list()
         code_actions = list()
         checked = set()
@@ -1,10 +1,17 @@
+import bisect
 import copy
+import functools
+import hashlib
+import json
 import logging
+import os
+import pickle
 import sys
 import tempfile
+from collections import deque
 from dataclasses import dataclass
-from itertools import chain
-from typing import Dict, Generator, List, Optional
+from itertools import accumulate, chain
+from typing import Dict, Generator, List, Optional, Tuple
 
 import langdetect
 from lsprotocol.types import (
@@ -20,7 +27,13 @@ from tree_sitter import Language, Node, Parser, Tree
 
 from .. import documents
 from ..types import Interval, OffsetPositionInterval, OffsetPositionIntervalList
-from ..utils import get_class, get_user_cache, git_clone, synchronized
+from ..utils import (
+    get_class,
+    get_textlsp_version,
+    get_user_cache,
+    git_clone,
+    synchronized,
+)
 
 logger = logging.getLogger(__name__)
 _codec = PositionCodec()
@@ -45,6 +58,8 @@ class BaseDocument(TextDocument):
             self.config = config
 
         self._language = None
+        # cleaned -> (source, lines, line start offsets)
+        self._line_index_cache = dict()
 
     @property
     def language(self) -> str:
@@ -87,26 +102,43 @@ class BaseDocument(TextDocument):
     def cleaned_source(self) -> str:
         return self.source
 
+    @property
+    def lines(self) -> List[str]:
+        return self._line_index(False)[0]
+
     @property
     def cleaned_lines(self):
-        return self.cleaned_source.splitlines(True)
+        return self._line_index(True)[0]
+
+    def _line_index(self, cleaned=False) -> Tuple[List[str], List[int]]:
+        """
+        Returns the lines of the source and the offsets at which they start,
+        the last item being the length of the source. Both are cached until
+        the source changes, so the returned lists should not be modified.
+        """
+        source = self.cleaned_source if cleaned else self.source
+        cache = self._line_index_cache.get(cleaned)
+        if cache is None or cache[0] is not source:
+            lines = source.splitlines(True)
+            starts = list(accumulate(map(len, lines), initial=0))
+            cache = (source, lines, starts)
+            self._line_index_cache[cleaned] = cache
+
+        return cache[1], cache[2]
 
     def position_at_offset(self, offset: int, cleaned=False) -> Position:
-        pos = 0
-        lines = self.cleaned_lines if cleaned else self.lines
-        for lidx, line in enumerate(lines):
-            line_len = len(line)
-            if pos + line_len > offset:
-                return Position(
-                    line=lidx,
-                    character=offset-pos
-                )
-            pos += line_len
+        lines, starts = self._line_index(cleaned)
+        if offset < starts[-1]:
+            lidx = max(bisect.bisect_right(starts, offset)-1, 0)
+            return Position(
+                line=lidx,
+                character=offset-starts[lidx]
+            )
 
-        assert offset == pos, 'Offset it over the document\'s end!'
+        assert offset == starts[-1], 'Offset it over the document\'s end!'
         return Position(
-            line=lidx,
-            character=offset-pos
+            line=max(len(lines)-1, 0),
+            character=0
         )
 
     def range_at_offset(self, offset: int, length: int, cleaned=False) -> Range:
@@ -120,19 +152,18 @@ class BaseDocument(TextDocument):
                 end=start,
             )
 
-        length = start.character + length
-        lines = self.cleaned_lines if cleaned else self.lines
-        for lidx, line in enumerate(lines[start.line:], start.line):
-            line_len = len(line)
-            if line_len >= length:
-                return Range(
-                    start=start,
-                    end=Position(
-                        line=lidx,
-                        character=length-1
-                    )
+        lines, starts = self._line_index(cleaned)
+        end_offset = starts[start.line] + start.character + length
+        # first line which ends at or after end_offset
+        lidx = bisect.bisect_left(starts, end_offset, lo=start.line+1) - 1
+        if lidx < len(lines):
+            return Range(
+                start=start,
+                end=Position(
+                    line=lidx,
+                    character=end_offset-starts[lidx]-1
                 )
-            length -= line_len
+            )
 
         return Range(
             start=start,
@@ -144,10 +175,10 @@ class BaseDocument(TextDocument):
 
     def offset_at_position(self, position: Position, cleaned=False) -> int:
         # doesn't really matter
-        lines = self.cleaned_lines if cleaned else self.lines
+        lines, starts = self._line_index(cleaned)
         pos = _codec.position_from_client_units(lines, position)
         row, col = pos.line, pos.character
-        return col + sum(len(line) for line in lines[:row])
+        return col + starts[min(row, len(lines))]
 
     def text_at_offset(self, offset: int, length: int, cleaned=False) -> Interval:
         source = self.cleaned_source if cleaned else self.source
@@ -160,6 +191,8 @@ class BaseDocument(TextDocument):
         len_source = len(source)
 
         assert start_idx >= 0
+        if len_source == 0:
+            return Interval(0, 0)
         assert end_idx < len_source
 
         while True:
@@ -190,32 +223,33 @@ class BaseDocument(TextDocument):
         source = self.cleaned_source if cleaned else self.source
         len_source = len(source)
 
-        start_idx = offset
-        assert start_idx >= 0
-        if start_idx >= len_source:
-            start_idx = len_source - 1
+        assert offset >= 0
+        if len_source == 0:
+            return Interval(0, 0)
+        start_idx = min(offset, len_source-1)
         end_idx = start_idx
 
-        while (
-            start_idx >= 0
-            and not (
-                all(source[start_idx-i] == '\n' for i in range(1, min(3, start_idx+1)))
-                or all(source[start_idx-i] == '\n' for i in range(min(2, start_idx+1)))  # empty line
-            )
-        ):
-            start_idx -= 1
+        # paragraphs start after an empty line or at an empty line
+        nl_idx = source.rfind('\n\n', 0, start_idx+1)
+        if nl_idx >= 0:
+            start_idx = min(nl_idx+2, start_idx)
+        elif start_idx > 0 and source[0] == '\n':
+            start_idx = 1
+        else:
+            start_idx = 0
+
+        min_end_idx = max(start_idx+min_length-1, min_offset+1)
+        if source[start_idx] == '\n' and (start_idx == 0 or source[start_idx-1] == '\n'):
+            # empty line
+            end_idx = max(end_idx, min(len_source-1, min_end_idx))
+            return Interval(start_idx, end_idx-start_idx+1)
 
         while True:
-            while (
-                end_idx < len_source-1
-                and not (
-                    all(source[end_idx+i] == '\n' for i in range(min(2, len_source-end_idx)))
-                    or all(source[start_idx-i] == '\n' for i in range(min(2, start_idx+1)))  # empty line
-                )
-            ):
-                end_idx += 1
+            end_idx = source.find('\n\n', end_idx)
+            if end_idx < 0:
+                end_idx = len_source - 1
 
-            if end_idx < len_source-1 and (end_idx-start_idx+1 < min_length or end_idx <= min_offset):
+            if end_idx < len_source-1 and end_idx < min_end_idx:
                 end_idx += 1
             else:
                 break
@@ -381,6 +415,18 @@ class TreeSitterDocument(CleanableDocument):
     CONFIGURATION_REPARSE_ALL = 'reparse_all'
     DEFAULT_REPARSE_ALL = True
 
+    # store the cleaned text of opened documents on disk to skip parsing
+    # them again when they are opened with the same content
+    CONFIGURATION_PARSE_CACHE = 'parse_cache'
+    DEFAULT_PARSE_CACHE = False
+    PARSE_CACHE_PATH = '{}/parse_cache'.format(get_user_cache())
+    PARSE_CACHE_MAX_SIZE = 200
+    # settings which change the cleaned text, part of the cache key
+    PARSE_CACHE_CONFIG_KEYS = ()
+
+    # compiled queries, they only depend on the document type
+    _queries = dict()
+
     def __init__(self, language_name, grammar_url, branch, *args, **kwargs):
         super().__init__(*args, **kwargs)
         #######################################################################
@@ -393,8 +439,11 @@ class TreeSitterDocument(CleanableDocument):
             self._ts_language
         )
         self._tree = None
-        self._query = self._build_query()
+        self._query = self._get_query()
         #######################################################################
+        # previous tree edited according to the changes since its last
+        # parse, it's reused when reparsing the source
+        self._old_tree = None
 
         self._text_intervals = None
 
@@ -403,7 +452,10 @@ class TreeSitterDocument(CleanableDocument):
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k not in {'_ts_language', '_ts_parser', '_tree', '_query'}:
+            if k in {'_tree', '_old_tree'}:
+                # trees are edited in place so they cannot be shared
+                setattr(result, k, None)
+            elif k not in {'_ts_language', '_ts_parser', '_query'}:
                 setattr(result, k, copy.deepcopy(v, memo))
             else:
                 setattr(result, k, v)
@@ -419,6 +471,7 @@ class TreeSitterDocument(CleanableDocument):
             )
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_language(cls, name, url, branch=None) -> Language:
         try:
             return Language(
@@ -442,11 +495,20 @@ class TreeSitterDocument(CleanableDocument):
         parser.set_language(language)
         return parser
 
+    def _get_query(self):
+        query = TreeSitterDocument._queries.get(type(self))
+        if query is None:
+            query = self._build_query()
+            TreeSitterDocument._queries[type(self)] = query
+        return query
+
     def _build_query(self):
         raise NotImplementedError()
 
     def _parse_source(self):
-        return self._ts_parser.parse(bytes(self.source, 'utf-8'))
+        tree = self._ts_parser.parse(bytes(self.source, 'utf-8'), self._old_tree)
+        self._old_tree = None
+        return tree
 
     @property
     def tree(self) -> Tree:
@@ -455,6 +517,16 @@ class TreeSitterDocument(CleanableDocument):
         return self._tree
 
     def _clean_source(self, change: TextDocumentContentChangeEvent_Type1 = None):
+        cache_path = None
+        if self._text_intervals is None and self.config.get(
+            self.CONFIGURATION_PARSE_CACHE,
+            self.DEFAULT_PARSE_CACHE,
+        ):
+            # only the initial content is cached, edits are handled in memory
+            cache_path = self._get_parse_cache_path()
+            if self._load_parse_cache(cache_path):
+                return
+
         self._text_intervals = OffsetPositionIntervalList()
 
         offset = 0
@@ -475,6 +547,60 @@ class TreeSitterDocument(CleanableDocument):
 
         self._cleaned_source = ''.join(self._text_intervals.values)
 
+        if cache_path is not None:
+            self._store_parse_cache(cache_path)
+
+    def _get_parse_cache_path(self) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(get_textlsp_version().encode('utf-8'))
+        digest.update(type(self).__qualname__.encode('utf-8'))
+        # sets, such as the org todo keywords, are stored sorted
+        digest.update(json.dumps(
+            [self.config.get(key) for key in self.PARSE_CACHE_CONFIG_KEYS],
+            default=sorted,
+        ).encode('utf-8'))
+        digest.update(self.source.encode('utf-8'))
+        return os.path.join(self.PARSE_CACHE_PATH, f'{digest.hexdigest()}.pickle')
+
+    def _load_parse_cache(self, path: str) -> bool:
+        try:
+            with open(path, 'rb') as f:
+                text_intervals = pickle.load(f)
+            # keep recently used items when evicting
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        except Exception:
+            logger.warning(f'Could not load parse cache: {path}', exc_info=True)
+            return False
+
+        self._text_intervals = text_intervals
+        self._cleaned_source = ''.join(self._text_intervals.values)
+        return True
+
+    def _store_parse_cache(self, path: str):
+        try:
+            os.makedirs(self.PARSE_CACHE_PATH, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.PARSE_CACHE_PATH,
+                suffix='.tmp',
+                delete=False,
+            ) as f:
+                pickle.dump(self._text_intervals, f)
+            os.replace(f.name, path)
+
+            entries = [
+                entry
+                for entry in os.scandir(self.PARSE_CACHE_PATH)
+                if entry.name.endswith('.pickle')
+            ]
+            if len(entries) > self.PARSE_CACHE_MAX_SIZE:
+                entries.sort(key=lambda entry: entry.stat().st_mtime)
+                for entry in entries[:len(entries)-self.PARSE_CACHE_MAX_SIZE]:
+                    os.remove(entry.path)
+        except OSError:
+            logger.warning(f'Could not store parse cache: {path}', exc_info=True)
+
     def _iterate_text_nodes(
             self,
             tree: Tree,
@@ -484,7 +610,7 @@ class TreeSitterDocument(CleanableDocument):
         raise NotImplementedError()
 
     def _get_edit_positions(self, change):
-        lines = self.lines
+        lines, line_starts = self._line_index()
         change_range = change.range
         change_range = _codec.range_from_client_units(lines, change_range)
         start_line = change_range.start.line
@@ -501,18 +627,29 @@ class TreeSitterDocument(CleanableDocument):
                 end_line = len(lines) - 1
                 end_col = len(lines[end_line]) - 1
 
-            start_byte = len(bytes(
-                ''.join(
-                    lines[:start_line] + [lines[start_line][:start_col]]
-                ),
-                'utf-8',
-            ))
-            end_byte = len(bytes(
-                ''.join(
-                    lines[:end_line] + [lines[end_line][:end_col]]
-                ),
-                'utf-8',
-            ))
+            if start_line >= len_lines:
+                # appending after the last line break
+                start_offset = line_starts[-1]
+            else:
+                start_offset = line_starts[start_line] + min(start_col, len(lines[start_line]))
+            end_offset = line_starts[end_line] + min(end_col, len(lines[end_line]))
+
+            source = self.source
+            if source.isascii():
+                # this is cheap, str knows if it's pure ASCII
+                start_byte = start_offset
+                end_byte = end_offset
+            else:
+                start_byte = len(source[:start_offset].encode('utf-8'))
+                if end_offset >= start_offset:
+                    end_byte = start_byte + len(source[start_offset:end_offset].encode('utf-8'))
+                else:
+                    end_byte = len(source[:end_offset].encode('utf-8'))
+
+                # tree-sitter points use UTF-8 byte columns
+                if start_line < len_lines:
+                    start_col = len(lines[start_line][:start_col].encode('utf-8'))
+                end_col = len(lines[end_line][:end_col].encode('utf-8'))
         text_bytes = len(bytes(change.text, 'utf-8'))
 
         if end_byte - start_byte == 0:
@@ -588,9 +725,10 @@ class TreeSitterDocument(CleanableDocument):
     ):
         sp = start_point
         if len(self._text_intervals) > 0:
+            first_interval_end = self._text_intervals.get_end_position(0)
             old_first_interval_end_point = (
-                self._text_intervals.get_interval(0).position_range.end.line,
-                self._text_intervals.get_interval(0).position_range.end.character
+                first_interval_end.line,
+                first_interval_end.character,
             )
         else:
             old_first_interval_end_point = (0, 0)
@@ -911,10 +1049,14 @@ class TreeSitterDocument(CleanableDocument):
             self.CONFIGURATION_REPARSE_ALL,
             self.DEFAULT_REPARSE_ALL,
         )
-        if reparse_all:
+        if reparse_all or self._tree is None:
+            # keep the edited tree so that only the changed subtrees are
+            # reparsed when the tree is needed next time
+            tree = self._tree if self._tree is not None else self._old_tree
+            if tree is not None:
+                self._edit_tree(tree, change)
+            self._old_tree = tree
             self._tree = None
-
-        if self._tree is None:
             super()._apply_incremental_change(change)
             return
 
@@ -1005,6 +1147,31 @@ class TreeSitterDocument(CleanableDocument):
         """Apply a ``Full`` text change to the document."""
         super()._apply_full_change(change)
         self._tree = None
+        self._old_tree = None
+
+    def _edit_tree(self, tree: Tree, change: TextDocumentContentChangeEvent_Type1):
+        (
+                _,
+                _,
+                _,
+                _,
+                start_byte,
+                old_end_byte,
+                new_end_byte,
+                _,
+                start_point,
+                old_end_point,
+                new_end_point,
+        ) = self._get_edit_positions(change)
+
+        tree.edit(
+            start_byte=start_byte,
+            old_end_byte=old_end_byte,
+            new_end_byte=new_end_byte,
+            start_point=start_point,
+            old_end_point=old_end_point,
+            new_end_point=new_end_point,
+        )
 
     def position_at_offset(self, offset: int, cleaned=False) -> Position:
         if not cleaned:
@@ -1013,13 +1180,15 @@ class TreeSitterDocument(CleanableDocument):
         if self._cleaned_source is None:
             self._clean_source()
 
-        item = self._text_intervals.get_interval_at_offset(offset)
-        assert offset >= item.offset_interval.start
-        diff = offset - item.offset_interval.start
+        idx = self._text_intervals.get_idx_at_offset(offset)
+        item_start, _ = self._text_intervals.get_offset_interval(idx)
+        assert offset >= item_start
+        diff = offset - item_start
+        start = self._text_intervals.get_start_position(idx)
 
         return Position(
-            line=item.position_range.start.line,
-            character=item.position_range.start.character+diff,
+            line=start.line,
+            character=self._get_character(start)+diff,
         )
 
     def range_at_offset(self, offset: int, length: int, cleaned=False) -> Range:
@@ -1034,14 +1203,16 @@ class TreeSitterDocument(CleanableDocument):
             )
 
         offset += length
-        item = self._text_intervals.get_interval_at_offset(offset-1)
-        item_end = item.offset_interval.start + item.offset_interval.length
-        assert offset <= item_end, f'{offset}, {item_end}, {item}'
+        idx = self._text_intervals.get_idx_at_offset(offset-1)
+        item_start, item_length = self._text_intervals.get_offset_interval(idx)
+        item_end = item_start + item_length
+        assert offset <= item_end, f'{offset}, {item_end}, {idx}'
         diff = item_end - offset
+        item_end_position = self._text_intervals.get_end_position(idx)
 
         end = Position(
-            line=item.position_range.end.line,
-            character=item.position_range.end.character-diff,
+            line=item_end_position.line,
+            character=self._get_character(item_end_position)-diff,
         )
 
         return Range(
@@ -1056,15 +1227,22 @@ class TreeSitterDocument(CleanableDocument):
         if self._cleaned_source is None:
             self._clean_source()
 
-        item = self._text_intervals.get_interval_at_position(position, False)
+        idx = self._text_intervals.get_idx_at_position(
+            self._to_point_position(position),
+            False
+        )
+        item_start, _ = self._text_intervals.get_offset_interval(idx)
 
+        start_character = self._get_character(
+            self._text_intervals.get_start_position(idx)
+        )
         if (
-            item.position_range.end.line == position.line
-            and item.position_range.start.character <= position.character
+            self._text_intervals.get_end_position(idx).line == position.line
+            and start_character <= position.character
         ):
-            diff = position.character - item.position_range.start.character
-            return item.offset_interval.start + diff
-        return item.offset_interval.start
+            diff = position.character - start_character
+            return item_start + diff
+        return item_start
 
     def paragraphs_at_range(self, position_range: Range, cleaned=False) -> List[Interval]:
         if not cleaned:
@@ -1074,25 +1252,34 @@ class TreeSitterDocument(CleanableDocument):
             self._clean_source()
 
         res = list()
-        res_set = set()
 
         idx = self._text_intervals.get_idx_at_position(
-            position_range.start,
+            self._to_point_position(position_range.start),
             strict=False
         )
-        for i in range(idx, len(self._text_intervals)):
-            interval = self._text_intervals.get_interval(i)
-            if interval.position_range.start > position_range.end:
+        range_end = self._to_point_position(position_range.end)
+        num_intervals = len(self._text_intervals)
+        while idx < num_intervals:
+            if self._text_intervals.get_start_position(idx) > range_end:
                 break
 
+            item_start, item_length = self._text_intervals.get_offset_interval(idx)
             paragraph = self.paragraph_at_offset(
-                interval.offset_interval.start,
-                min_length=interval.offset_interval.length,
+                item_start,
+                min_length=item_length,
                 cleaned=True
             )
-            if paragraph is not None and paragraph not in res_set:
+            if len(res) == 0 or paragraph != res[-1]:
                 res.append(paragraph)
-                res_set.add(paragraph)
+
+            # skip the intervals which are covered by the paragraph, the text
+            # intervals are contiguous in the cleaned source
+            next_idx = self._text_intervals.get_idx_at_offset(
+                paragraph.start+paragraph.length
+            )
+            if next_idx is None:
+                break
+            idx = max(idx+1, next_idx)
 
         return res
 
@@ -1103,8 +1290,49 @@ class TreeSitterDocument(CleanableDocument):
         if self._cleaned_source is None:
             self._clean_source()
 
-        last = self._text_intervals.get_interval(len(self._text_intervals)-1)
-        return last.position_range.end
+        last = self._text_intervals.get_end_position(len(self._text_intervals)-1)
+        return Position(
+            line=last.line,
+            character=self._get_character(last),
+        )
+
+    # The text intervals store tree-sitter points, i.e. their columns are
+    # UTF-8 byte offsets, while positions of the document API are measured in
+    # characters. The two only differ in lines with non-ASCII content.
+
+    def _get_character(self, point: Position) -> int:
+        # index of the character the byte at the column belongs to
+        lines = self.lines
+        if point.line >= len(lines) or lines[point.line].isascii():
+            return point.character
+
+        line = lines[point.line].encode('utf-8')
+        return (
+            len(line[:point.character].decode('utf-8', 'ignore'))
+            + max(0, point.character-len(line))
+        )
+
+    @staticmethod
+    def _text_between(lines: List[str], line: int, start: int, end: int) -> str:
+        # text of a source line between two byte columns
+        text = lines[line]
+        if text.isascii():
+            return text[start:end]
+        return text.encode('utf-8')[start:end].decode('utf-8', 'ignore')
+
+    def _to_point_position(self, position: Position) -> Position:
+        lines = self.lines
+        if position.line >= len(lines) or lines[position.line].isascii():
+            return position
+
+        line = lines[position.line]
+        return Position(
+            line=position.line,
+            character=(
+                len(line[:position.character].encode('utf-8'))
+                + max(0, position.character-len(line))
+            ),
+        )
 
 
 class DocumentTypeFactory():
@@ -1183,25 +1411,78 @@ class ChangeTracker():
         # negative span_length means that the span was deleted
         self._items = [(length, False)]
         self.full_document_change = False
+        # changes are applied to the copy when they are queried
+        self._pending_changes = deque()
+        self._changes_applied = False
 
     def _set_document(self, doc: BaseDocument):
         # XXX not too memory efficient
         self.document = copy.deepcopy(doc)
 
-    def update_document(
-            self,
-            change: TextDocumentContentChangeEvent,
-            updated_doc: BaseDocument
-    ):
+    def update_document(self, change: TextDocumentContentChangeEvent):
+        """
+        Registers a change of the document. The change is applied to the
+        tracker's own copy of the document only when the changes are queried,
+        so that editing does not wait for the copy to be updated.
+        """
+        if type(change) == TextDocumentContentChangeEvent_Type2:
+            # the new text replaces the result of all previous changes
+            self._pending_changes.clear()
+            self.set_full_document_change()
+        self._pending_changes.append(change)
+
+    def _apply_pending_changes(self):
+        while len(self._pending_changes) > 0:
+            self._changes_applied = True
+            self._apply_change(self._pending_changes.popleft())
+
+    def restore_changes(self, changes: List[Interval], version: int):
+        """
+        Marks changes which were taken from a previous tracker but could not
+        be processed, e.g. because the document was edited while checking
+        them.
+
+        :param changes: intervals in the offsets of the given version of the
+        document
+        """
         if self.full_document_change:
             return
 
-        if type(change) == TextDocumentContentChangeEvent_Type2:
-            self.full_document_change = True
-            self._items = [(-1, True)]
+        if self._changes_applied or self.document.version != version:
+            # the offsets don't belong to the tracked text anymore
+            self.set_full_document_change()
             return
 
+        for change in changes:
+            self._mark_changed(change)
+
+    def _mark_changed(self, interval: Interval):
+        start = interval.start
+        end = interval.start + max(1, interval.length)
         new_lst = list()
+        pos = 0
+        for length, changed in self._items:
+            item_end = pos + length
+            for part_start, part_end, part_changed in [
+                (pos, min(item_end, start), changed),
+                (max(pos, start), min(item_end, end), True),
+                (max(pos, end), item_end, changed),
+            ]:
+                if part_end > part_start:
+                    new_lst.append((part_end-part_start, part_changed))
+            pos = item_end
+
+        self._items = new_lst
+
+    def _apply_change(self, change: TextDocumentContentChangeEvent):
+        if (
+            self.full_document_change
+            or type(change) == TextDocumentContentChangeEvent_Type2
+        ):
+            self.set_full_document_change()
+            self.document.apply_change(change)
+            return
+
         start_offset = self.document.offset_at_position(
             change.range.start,
             self.cleaned,
@@ -1210,9 +1491,11 @@ class ChangeTracker():
             change.range.end,
             self.cleaned,
         )
+        change_length = len(change.text)
+        self.document.apply_change(change)
 
+        new_lst = list()
         item_idx, item_offset = self._get_offset_idx(start_offset)
-        change_length = len(change.text)
         range_length = end_offset-start_offset
         relative_start_offset = start_offset - item_offset
 
@@ -1222,7 +1505,6 @@ class ChangeTracker():
 
         if start_offset == end_offset and change_length == 0:
             # nothing to do (I'm not sure what this is)
-            self._set_document(updated_doc)
             return
 
         if change_length == 0:
@@ -1257,7 +1539,10 @@ class ChangeTracker():
                 new_lst.append(tmp_item)
 
         self._replace_at(item_idx, new_lst)
-        self._set_document(updated_doc)
+
+    def set_full_document_change(self):
+        self.full_document_change = True
+        self._items = [(-1, True)]
 
     def _get_offset_idx(self, offset):
         pos = 0
@@ -1271,13 +1556,11 @@ class ChangeTracker():
         return idx, pos
 
     def _replace_at(self, idx, tuples):
-        length = len(tuples)
-        assert length > 0
-        self._items[idx] = tuples[0]
-        for i in range(1, length):
-            self._items.insert(idx+i, tuples[i])
+        assert len(tuples) > 0
+        self._items[idx:idx+1] = tuples
 
     def get_changes(self) -> List[Interval]:
+        self._apply_pending_changes()
         if self.cleaned:
             doc_length = len(self.document.cleaned_source)
         else:
@@ -1317,4 +1600,5 @@ class ChangeTracker():
         return res
 
     def __len__(self):
-        return len([item for item in self._items if item[1]])
+        self._apply_pending_changes()
+        return sum(1 for item in self._items if item[1])
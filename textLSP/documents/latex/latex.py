@@ -1,3 +1,4 @@
+from collections import deque
 from typing import Generator
 from tree_sitter import Tree
 
@@ -66,42 +67,47 @@ class LatexDocument(TreeSitterDocument):
             start_point,
             end_point,
     ) -> Generator[TextNode, None, None]:
-        lines = tree.text.decode('utf-8').split('\n')
+        lines = self.source.split('\n')
 
         last_sent = None
-        new_lines_after = list()
+        new_lines_after = deque()
+        node_content = self.NODE_CONTENT
+        node_newline_before_after = self.NODE_NEWLINE_BEFORE_AFTER
+
+        captures = self._query.captures(tree.root_node, start_point=start_point, end_point=end_point)
+        for ts_node, capture in captures:
+            # tree-sitter builds a new tuple on each access
+            node_start = ts_node.start_point
 
-        for node in self._query.captures(tree.root_node, start_point=start_point, end_point=end_point):
             # Check if we need some newlines after previous elements
             while len(new_lines_after) > 0:
-                if node[0].start_point > new_lines_after[0]:
+                if node_start > new_lines_after[0]:
                     if last_sent is not None:
                         for nl in TextNode.get_new_lines(2, last_sent.end_point):
                             last_sent = nl
                             yield nl
-                    new_lines_after.pop(0)
+                    new_lines_after.popleft()
                 else:
                     break
 
-            if node[1] == self.NODE_CONTENT:
+            if capture == node_content:
                 # check if we need newlines due to linebreaks in source
                 if (
                     last_sent is not None
                     and last_sent.text[-1] != '\n'
-                    and node[0].start_point[0] - last_sent.end_point[0] > 1
-                    and '' in lines[last_sent.end_point[0]+1:node[0].start_point[0]]
+                    and node_start[0] - last_sent.end_point[0] > 1
+                    and '' in lines[last_sent.end_point[0]+1:node_start[0]]
                 ):
                     for nl_node in TextNode.get_new_lines(2, last_sent.end_point):
                         yield nl_node
                         last_sent = nl_node
 
                 # handle spaces
-                if self._needs_space_before(node[0], lines, last_sent):
-                    sp = node[0].start_point
-                    if sp[1] > 0:
+                if self._needs_space_before(ts_node, lines, last_sent):
+                    if node_start[1] > 0:
                         yield TextNode.space(
-                            start_point=(sp[0], sp[1]-1),
-                            end_point=(sp[0], sp[1]-1),
+                            start_point=(node_start[0], node_start[1]-1),
+                            end_point=(node_start[0], node_start[1]-1),
                         )
                     else:
                         yield TextNode.space(
@@ -121,23 +127,21 @@ class LatexDocument(TreeSitterDocument):
                 # - https://github.com/latex-lsp/tree-sitter-latex/issues/73
                 # - https://github.com/latex-lsp/tree-sitter-latex/issues/74
                 # and remove this block when the issues are fixed.
-                line = self.lines[node[0].end_point[0]]
-                char = None
-                if node[0].end_point[1] < len(line):
-                    char = line[node[0].end_point[1]]
+                node_end = ts_node.end_point
+                char = self._text_between(lines, node_end[0], node_end[1], node_end[1]+1)
 
                 if char in {',', '-'}:
                     last_sent = TextNode(
-                        text=node[0].text.decode('utf-8')+char,
-                        start_point=node[0].start_point,
-                        end_point=(node[0].end_point[0], node[0].end_point[1])  # node.end_point[1]-1+1
+                        text=ts_node.text.decode('utf-8')+char,
+                        start_point=node_start,
+                        end_point=node_end,  # node.end_point[1]-1+1
                     )
                 else:
                     ###########################################################
-                    last_sent = TextNode.from_ts_node(node[0])
+                    last_sent = TextNode.from_ts_node(ts_node)
                 yield last_sent
-            elif node[1] == self.NODE_NEWLINE_BEFORE_AFTER:
-                new_lines_after.append(node[0].end_point)
+            elif capture == node_newline_before_after:
+                new_lines_after.append(ts_node.end_point)
                 if last_sent is not None:
                     for nl_node in TextNode.get_new_lines(2, last_sent.end_point):
                         yield nl_node
@@ -152,5 +156,10 @@ class LatexDocument(TreeSitterDocument):
         if last_sent is None or last_sent.text[-1] == '\n':
             return False
         if node.start_point[0] == last_sent.end_point[0]:
-            return ' ' in lines[node.start_point[0]][last_sent.end_point[1]:node.start_point[1]]
+            return ' ' in self._text_between(
+                lines,
+                node.start_point[0],
+                last_sent.end_point[1],
+                node.start_point[1],
+            )
         return last_sent.text != '\n'
@@ -76,7 +76,7 @@ class MarkDownDocument(TreeSitterDocument):
             start_point,
             end_point,
     ) -> Generator[TextNode, None, None]:
-        lines = tree.text.decode('utf-8').split('\n')
+        lines = self.source.split('\n')
 
         last_sent = None
         new_lines_after = list()
@@ -160,7 +160,8 @@ class MarkDownDocument(TreeSitterDocument):
                 )
                 line_offset += 1
 
-            token_len = len(token)
+            # columns of tree-sitter points are UTF-8 byte offsets
+            token_len = len(token.encode('utf-8'))
             node = TextNode(
                 text=token,
                 start_point=(
@@ -194,6 +195,11 @@ class MarkDownDocument(TreeSitterDocument):
             text = node.text.decode('utf-8')
             # text nodes contain whitespaces which can lead to errors
             # E.g.: |~~This~~| is a text|
-            diff = len(text) - len(text.lstrip())
-            return ' ' in lines[node.start_point[0]][last_sent.end_point[1]:node.start_point[1]+diff]
+            diff = len(node.text) - len(text.lstrip().encode('utf-8'))
+            return ' ' in self._text_between(
+                lines,
+                node.start_point[0],
+                last_sent.end_point[1],
+                node.start_point[1]+diff,
+            )
         return last_sent.text != '\n'
@@ -9,6 +9,8 @@ class OrgDocument(TreeSitterDocument):
 
     DEFAULT_TODO_KEYWORDS = {'TODO', 'DONE'}
 
+    PARSE_CACHE_CONFIG_KEYS = (CONFIGURATION_TODO_KEYWORDS,)
+
     EXPR = 'expr'
     HEADLINE = 'headline'
     PARAGRAPH = 'paragraph'
@@ -75,7 +77,7 @@ class OrgDocument(TreeSitterDocument):
             start_point,
             end_point,
     ) -> Generator[TextNode, None, None]:
-        lines = tree.text.decode('utf-8').split('\n')
+        lines = self.source.split('\n')
 
         last_sent = None
         new_lines_after = list()
@@ -159,5 +161,10 @@ class OrgDocument(TreeSitterDocument):
         if last_sent is None or last_sent.text[-1] == '\n':
             return False
         if node.start_point[0] == last_sent.end_point[0]:
-            return ' ' in lines[node.start_point[0]][last_sent.end_point[1]:node.start_point[1]]
+            return ' ' in self._text_between(
+                lines,
+                node.start_point[0],
+                last_sent.end_point[1],
+                node.start_point[1],
+            )
         return last_sent.text != '\n'
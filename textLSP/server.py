@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from typing import List, Optional
@@ -55,6 +56,16 @@ class TextLSPLanguageServerProtocol(LanguageServerProtocol):
         self._server.update_settings(params.initialization_options)
         return result
 
+    @lsp_method(TEXT_DOCUMENT_DID_CHANGE)
+    def lsp_text_document__did_change(self, params: DidChangeTextDocumentParams) -> None:
+        content_changes = list()
+        for change in params.content_changes:
+            # the updated changes are also used by the analysers
+            change = self.workspace.get_incremental_change(params.text_document, change)
+            self.workspace.update_text_document(params.text_document, change)
+            content_changes.append(change)
+        params.content_changes = content_changes
+
 
 class TextLSPLanguageServer(LanguageServer):
     # TODO make a config class for easier settings hangling and option for
@@ -68,9 +79,16 @@ class TextLSPLanguageServer(LanguageServer):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if hasattr(asyncio, 'eager_task_factory'):
+            # coroutines that finish without suspending (e.g. analysers
+            # without anything to do) don't need to be scheduled on the loop
+            # (Python 3.12+)
+            self.loop.set_task_factory(asyncio.eager_task_factory)
         self.settings = dict()
         self.init_settings()
         self.analyser_handler = AnalyserHandler(self)
+        # uri -> (document version, diagnostics summary) of the last publish
+        self._published_diagnostics = dict()
         logger.warning('TextLSP initialized!')
 
     def init_settings(self):
@@ -120,8 +138,34 @@ class TextLSPLanguageServer(LanguageServer):
         diagnostics = list()
         for lst in self.analyser_handler.get_diagnostics(doc):
             diagnostics.extend(lst)
+
+        # diagnostics are updated in place so store their content
+        summary = tuple(
+            (
+                diag.range.start.line,
+                diag.range.start.character,
+                diag.range.end.line,
+                diag.range.end.character,
+                diag.severity,
+                diag.code,
+                diag.source,
+                diag.message,
+            )
+            for diag in diagnostics
+        )
+        last = self._published_diagnostics.get(doc.uri)
+        self._published_diagnostics[doc.uri] = (doc.version, summary)
+        if last is not None and last[0] != doc.version and last[1] == summary:
+            # The content was edited but the diagnostics are the same, no need
+            # to send them again. Repeated checks of the same version (e.g. on
+            # save) are always published.
+            return
+
         self.publish_diagnostics(doc.uri, diagnostics)
 
+    def forget_published_diagnostics(self, uri: str):
+        self._published_diagnostics.pop(uri, None)
+
     def shutdown(self):
         logger.warning('TextLSP shutting down!')
         self.analyser_handler.shutdown()
@@ -153,6 +197,7 @@ async def did_save(ls: TextLSPLanguageServer, params: DidSaveTextDocumentParams)
 @SERVER.feature(TEXT_DOCUMENT_DID_CLOSE)
 async def did_close(ls: TextLSPLanguageServer, params: DidCloseTextDocumentParams):
     await ls.analyser_handler.did_close(params)
+    ls.forget_published_diagnostics(params.text_document.uri)
 
 
 @SERVER.feature(SHUTDOWN)
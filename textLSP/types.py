@@ -4,7 +4,9 @@ import enum
 import difflib
 import uuid
 
-from typing import Optional, Any, List
+from array import array
+from itertools import accumulate
+from typing import Optional, Any, List, Tuple
 from dataclasses import dataclass
 from sortedcontainers import SortedDict
 
@@ -22,32 +24,25 @@ from .utils import position_to_tuple
 
 TEXT_PASSAGE_PATTERN = re.compile('[.?!] |\\n')
 LINE_PATTERN = re.compile('\\n')
+TOKEN_SPLIT_PATTERN = re.compile('(\\s)')
 
 
 class ConfigurationError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Interval():
     start: int
     length: int
 
-    def __eq__(self, o: object):
-        if not isinstance(o, Interval):
-            return NotImplemented
-        return self.start == o.start and self.length == o.length
-
-    def __hash__(self):
-        return hash((self.start, self.length))
-
     def __gt__(self, o: object):
         if not isinstance(o, Interval):
             return NotImplemented
         return self.start > o.start
 
 
-@dataclass
+@dataclass(slots=True)
 class OffsetPositionInterval():
     offset_interval: Interval
     position_range: Range
@@ -55,15 +50,30 @@ class OffsetPositionInterval():
 
 
 class OffsetPositionIntervalList():
+    QUERY_CACHE_SIZE = 256
+
+    __slots__ = (
+        '_offset_start',
+        '_offset_end',
+        '_position_start_line',
+        '_position_start_character',
+        '_position_end_line',
+        '_position_end_character',
+        '_value',
+        '_query_cache',
+    )
 
     def __init__(self):
-        self._offset_start = list()
-        self._offset_end = list()
-        self._position_start_line = list()
-        self._position_start_character = list()
-        self._position_end_line = list()
-        self._position_end_character = list()
+        # numeric columns are stored in compact int64 arrays
+        self._offset_start = array('q')
+        self._offset_end = array('q')
+        self._position_start_line = array('q')
+        self._position_start_character = array('q')
+        self._position_end_line = array('q')
+        self._position_end_character = array('q')
         self._value = list()
+        # results of repeated offset/position lookups, reset on mutation
+        self._query_cache = dict()
 
     def add_interval_values(
         self,
@@ -75,6 +85,8 @@ class OffsetPositionIntervalList():
         position_end_character: int,
         value: Any
     ):
+        if self._query_cache:
+            self._query_cache.clear()
         self._offset_start.append(offset_start)
         self._offset_end.append(offset_end)
         self._position_start_line.append(position_start_line)
@@ -113,6 +125,28 @@ class OffsetPositionIntervalList():
             value=self._value[idx]
         )
 
+    def get_offset_interval(self, idx: int) -> Tuple[int, int]:
+        """
+        :return: the start offset and length of the interval
+        """
+        start = self._offset_start[idx]
+        return start, self._offset_end[idx]-start+1
+
+    def get_start_position(self, idx: int) -> Position:
+        return Position(
+            line=self._position_start_line[idx],
+            character=self._position_start_character[idx],
+        )
+
+    def get_end_position(self, idx: int) -> Position:
+        return Position(
+            line=self._position_end_line[idx],
+            character=self._position_end_character[idx],
+        )
+
+    def get_value(self, idx: int) -> Any:
+        return self._value[idx]
+
     def __len__(self):
         return len(self._offset_start)
 
@@ -121,39 +155,40 @@ class OffsetPositionIntervalList():
         return self._value
 
     def sort(self):
-        indices = [
-            item[0]
-            for item in sorted(
-                enumerate(self._offset_start),
-                key=lambda x:x[1]
-            )
-        ]
-        self._offset_start = [
-            self._offset_start[idx]
-            for idx in indices
-        ]
-        self._offset_end = [
-            self._offset_end[idx]
-            for idx in indices
-        ]
-        self._position_start_line = [
-            self._position_start_line[idx]
-            for idx in indices
-        ]
-        self._position_start_character = [
-            self._position_start_character[idx]
-            for idx in indices
-        ]
-        self._position_end_line = [
-            self._position_end_line[idx]
-            for idx in indices
-        ]
-        self._position_end_character = [
-            self._position_end_character[idx]
+        self._query_cache.clear()
+        indices = sorted(
+            range(len(self._offset_start)),
+            key=self._offset_start.__getitem__
+        )
+        for name in (
+            '_offset_start',
+            '_offset_end',
+            '_position_start_line',
+            '_position_start_character',
+            '_position_end_line',
+            '_position_end_character',
+        ):
+            lst = getattr(self, name)
+            setattr(self, name, array('q', (lst[idx] for idx in indices)))
+        self._value = [
+            self._value[idx]
             for idx in indices
         ]
 
+    def _cache_query(self, key, idx):
+        cache = self._query_cache
+        if len(cache) >= self.QUERY_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = idx
+        return idx
+
     def get_idx_at_offset(self, offset: int) -> int:
+        try:
+            return self._query_cache[offset]
+        except KeyError:
+            return self._cache_query(offset, self._get_idx_at_offset(offset))
+
+    def _get_idx_at_offset(self, offset: int) -> int:
         min_lst = self._offset_start
         max_lst = self._offset_end
 
@@ -173,36 +208,40 @@ class OffsetPositionIntervalList():
         """
         :param strict: If Flase, return the idx of the next (or last) interval if does not exist
         """
-        idx = bisect.bisect_left(self._position_end_line, position.line)
-        length = len(self)
+        key = (position.line, position.character, strict)
+        try:
+            return self._query_cache[key]
+        except KeyError:
+            return self._cache_query(key, self._get_idx_at_position(position, strict))
+
+    def _get_idx_at_position(self, position: Position, strict=True) -> int:
+        end_lines = self._position_end_line
+        line = position.line
+        character = position.character
+        length = len(end_lines)
+        idx = bisect.bisect_left(end_lines, line)
 
         if idx == length:
             return None if strict else length-1
-        if position.line < self._position_start_line[idx]:
+        start_line = self._position_start_line[idx]
+        end_line = end_lines[idx]
+        if line < start_line:
             return None if strict else idx
-        if position.line > self._position_end_line[idx]:
+        if line > end_line:
             return None if strict else length-1
 
-        lst = list()
-        i = idx
-        while self._position_end_line[i] == self._position_end_line[idx]:
-            lst.append(self._position_end_character[i])
-            i += 1
-            if i >= length:
-                break
-
-        idx2 = bisect.bisect_left(lst, position.character)
-        idx += idx2
+        # intervals ending in the same line are ordered by their end character
+        end_idx = bisect.bisect_right(end_lines, end_line, lo=idx)
+        end_characters = self._position_end_character
+        idx = bisect.bisect_left(end_characters, character, lo=idx, hi=end_idx)
 
         if idx == length:
             return None if strict else length-1
 
-        if self._position_start_character[idx] <= position.character <= self._position_end_character[idx]:
+        start_character = self._position_start_character[idx]
+        if start_character <= character <= end_characters[idx]:
             return idx
-        if (
-                position.line < self._position_start_line[idx] or
-                position.character < self._position_start_character[idx]
-           ):
+        if line < self._position_start_line[idx] or character < start_character:
             return None if strict else idx
 
         return None if strict else min(idx+1, length-1)
@@ -258,29 +297,36 @@ class PositionDict():
 
     def remove_from(self, position: Position, inclusive=True):
         position = position_to_tuple(position)
-        num = 0
-        for key in list(self._positions.irange(
-            minimum=position,
-            inclusive=(inclusive, False)
-        )):
-            del self._positions[key]
-            num += 1
+        positions = self._positions
+        keys = positions.keys()
+        if inclusive:
+            start = positions.bisect_left(position)
+        else:
+            start = positions.bisect_right(position)
+        num = len(keys) - start
+        del keys[start:]
 
         return num
 
     def remove_between(self, range: Range, inclusive=(True, True)):
         minimum = position_to_tuple(range.start)
         maximum = position_to_tuple(range.end)
-        num = 0
-        for key in list(self._positions.irange(
-            minimum=minimum,
-            maximum=maximum,
-            inclusive=inclusive,
-        )):
-            del self._positions[key]
-            num += 1
+        positions = self._positions
+        keys = positions.keys()
+        if inclusive[0]:
+            start = positions.bisect_left(minimum)
+        else:
+            start = positions.bisect_right(minimum)
+        if inclusive[1]:
+            end = positions.bisect_right(maximum)
+        else:
+            end = positions.bisect_left(maximum)
+        if start >= end:
+            return 0
+        # slice deletion removes the keys in bulk from the sorted list
+        del keys[start:end]
 
-        return num
+        return end - start
 
     def irange(self, minimum: Position = None, maximum: Position = None, *args,
                **kwargs):
@@ -292,8 +338,7 @@ class PositionDict():
         return self._positions.irange(minimum, maximum, *args, **kwargs)
 
     def irange_values(self, *args, **kwargs):
-        for key in self.irange(*args, **kwargs):
-            yield self._positions[key]
+        return map(self._positions.__getitem__, self.irange(*args, **kwargs))
 
     def __iter__(self):
         return iter(self._positions.values())
@@ -319,25 +364,31 @@ class TokenDiff():
 
     @staticmethod
     def _split(text):
-        return [item for item in re.split("(\s)", text) if item != ""]
+        return list(filter(None, TOKEN_SPLIT_PATTERN.split(text)))
 
     @staticmethod
     def token_level_diff(text1, text2) -> List:
         tokens1 = TokenDiff._split(text1)
         tokens2 = TokenDiff._split(text2)
         diff = difflib.SequenceMatcher(None, tokens1, tokens2)
+        # offset of each token in text1
+        offsets = list(accumulate(map(len, tokens1), initial=0))
 
-        return [
-            TokenDiff(
-                type=item[0],
-                old_token=''.join(tokens1[item[1]:item[2]]),
-                new_token=''.join(tokens2[item[3]:item[4]]),
-                offset=0 if item[1] == 0 else len(''.join(tokens1[:item[1]])),
-                length=len(''.join(tokens1[item[1]:item[2]])),
-            )
-            for item in diff.get_opcodes()
-            if item[0] != 'equal'
-        ]
+        res = list()
+        for tag, i1, i2, j1, j2 in diff.get_opcodes():
+            if tag == 'equal':
+                continue
+
+            old_token = ''.join(tokens1[i1:i2])
+            res.append(TokenDiff(
+                type=tag,
+                old_token=old_token,
+                new_token=''.join(tokens2[j1:j2]),
+                offset=offsets[i1],
+                length=offsets[i2]-offsets[i1],
+            ))
+
+        return res
 
     def __str__(self):
         return (
@@ -395,4 +446,4 @@ class ProgressBar():
 
     @staticmethod
     def create_token():
-        return str(uuid.uuid4())
+        return uuid.uuid4().hex
@@ -5,6 +5,7 @@ import re
 
 from importlib.metadata import version
 from functools import wraps
+from typing import Tuple
 from threading import RLock
 from git import Repo
 from appdirs import user_cache_dir
@@ -81,18 +82,46 @@ def get_user_cache(app_name=None):
     return user_cache_dir(app_name)
 
 
+def get_changed_span(old: str, new: str) -> Tuple[int, int, int]:
+    """
+    Returns (start, old_end, new_end) such that old[start:old_end] was
+    replaced with new[start:new_end] and the rest of the texts are the same.
+    """
+    # binary searches, so that the texts are compared by str instead of char by
+    # char in python
+    low = 0
+    high = min(len(old), len(new))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[:mid] == new[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    start = low
+
+    low = 0
+    high = min(len(old), len(new)) - start
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[len(old)-mid:] == new[len(new)-mid:]:
+            low = mid
+        else:
+            high = mid - 1
+
+    return start, len(old)-low, len(new)-low
+
+
 def batch_text(text: str, pattern: re.Pattern, max_size: int, min_size: int = 0):
     sidx = 0
     eidx = max_size
     text_len = len(text)
     while eidx <= text_len:
-        matches = list(
-            pattern.finditer(
-                text[sidx:eidx]
-            )
-        )
-        if len(matches) > 0 and matches[-1].end() > min_size:
-            eidx = sidx + matches[-1].end()
+        # scan the window in place, only the last match is needed
+        match = None
+        for match in pattern.finditer(text, sidx, eidx):
+            pass
+        if match is not None and match.end() - sidx > min_size:
+            eidx = match.end()
 
         yield text[sidx:eidx]
         sidx = eidx
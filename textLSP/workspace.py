@@ -3,14 +3,19 @@ import logging
 from typing import Optional, Dict
 
 from lsprotocol.types import (
+    Position,
+    Range,
     TextDocumentContentChangeEvent,
+    TextDocumentContentChangeEvent_Type1,
+    TextDocumentContentChangeEvent_Type2,
+    TextDocumentSyncKind,
     VersionedTextDocumentIdentifier,
 )
 from pygls.workspace import Workspace, TextDocument
 
 from .documents.document import DocumentTypeFactory
 from .analysers.handler import AnalyserHandler
-from .utils import merge_dicts
+from .utils import merge_dicts, get_changed_span
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +64,45 @@ class TextLSPWorkspace(Workspace):
 
         self.settings = merge_dicts(self.settings, settings)
 
+    def get_incremental_change(
+        self,
+        text_doc: VersionedTextDocumentIdentifier,
+        change: TextDocumentContentChangeEvent
+    ) -> TextDocumentContentChangeEvent:
+        """
+        Turns a full text change into an incremental change of the span that
+        actually changed, so that only that part needs to be checked again.
+        """
+        if (
+            type(change) != TextDocumentContentChangeEvent_Type2
+            or self._sync_kind != TextDocumentSyncKind.Incremental
+            or text_doc.uri not in self._text_documents
+        ):
+            return change
+
+        doc = self._text_documents[text_doc.uri]
+        source = doc.source
+        start, old_end, new_end = get_changed_span(source, change.text)
+        change_range = Range(
+            start=self._position_at_offset(doc, start),
+            end=self._position_at_offset(doc, old_end),
+        )
+
+        return TextDocumentContentChangeEvent_Type1(
+            range=doc.position_codec.range_to_client_units(doc.lines, change_range),
+            text=change.text[start:new_end],
+        )
+
+    @staticmethod
+    def _position_at_offset(doc: TextDocument, offset: int) -> Position:
+        lines = doc.lines
+        if offset < len(doc.source):
+            return doc.position_at_offset(offset)
+        if len(lines) == 0 or lines[-1].splitlines()[0] != lines[-1]:
+            # the last line ends with a line break
+            return Position(line=len(lines), character=0)
+        return Position(line=len(lines)-1, character=len(lines[-1]))
+
     def update_text_document(
         self,
         text_doc: VersionedTextDocumentIdentifier,